@@ -1,44 +1,65 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
+import redis.asyncio as aioredis
 import logging
 import os
 
 from app.routers import insights
+from app.services.groq_service import GroqService
+from app.services.shopify_scraper import create_session
 
 # Load environment variables
 load_dotenv()
 
-# Configure detailed logging
+# Configure logging; set LOG_LEVEL=DEBUG for detailed output
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared Redis client for the scrape cache (disabled when REDIS_URL is unset)
+    redis_url = os.getenv("REDIS_URL")
+    app.state.redis = aioredis.from_url(redis_url) if redis_url else None
+    # One GroqService per process so its AsyncGroq connection pool is reused
+    app.state.groq = GroqService(redis=app.state.redis) if os.getenv("GROQ_API_KEY") else None
+    # One HTTP session for all scrapes so connections and DNS lookups are reused
+    app.state.http_session = create_session()
+    yield
+    await app.state.http_session.close()
+    if app.state.groq is not None:
+        await app.state.groq.client.close()
+    if app.state.redis is not None:
+        await app.state.redis.aclose()
+
 app = FastAPI(
     title="Shopify Insights Fetcher",
     description="Extract comprehensive insights from Shopify stores",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Global exception handlers
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    logging.error(f"Unhandled error for request {request.url}: {exc}", exc_info=True)
-    return JSONResponse(
+    logging.error("Unhandled error for request %s: %s", request.url, exc, exc_info=True)
+    return ORJSONResponse(
         status_code=500,
         content={"detail": f"Internal server error: {str(exc)}"},
     )
 
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
-    logging.warning(f"HTTP error {exc.status_code} for request {request.url}: {exc.detail}")
-    return JSONResponse(
+    logging.warning("HTTP error %s for request %s: %s", exc.status_code, request.url, exc.detail)
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
     )
@@ -67,5 +88,6 @@ async def root():
 async def status():
     return {
         "status": "running",
-        "groq_configured": bool(os.getenv("GROQ_API_KEY"))
+        "groq_configured": bool(os.getenv("GROQ_API_KEY")),
+        "cache_configured": bool(os.getenv("REDIS_URL"))
     }
@@ -1,8 +1,11 @@
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_validator
 from datetime import datetime
+from app.utils.helpers import normalize_url
 
 class ProductSchema(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     id: Optional[str] = None
     title: str
     handle: str
@@ -17,11 +20,15 @@ class ProductSchema(BaseModel):
     description: Optional[str] = None
 
 class ContactInfo(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     emails: List[str] = []
     phones: List[str] = []
     addresses: List[str] = []
 
 class SocialHandles(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     instagram: Optional[str] = None
     facebook: Optional[str] = None
     twitter: Optional[str] = None
@@ -30,6 +37,8 @@ class SocialHandles(BaseModel):
     linkedin: Optional[str] = None
 
 class FAQ(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     question: str
     answer: str
 
@@ -41,6 +50,8 @@ class PolicyInfo(BaseModel):
     shipping_policy: Optional[str] = None
 
 class BrandInsights(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     website_url: str
     brand_name: Optional[str] = None
     brand_description: Optional[str] = None
@@ -52,13 +63,36 @@ class BrandInsights(BaseModel):
     faqs: List[FAQ] = []
     important_links: Dict[str, str] = {}
     total_products: int = 0
-    scraped_at: datetime = datetime.now()
+    scraped_at: datetime = Field(default_factory=datetime.utcnow)
     status: str = "success"
     error_message: Optional[str] = None
 
 class InsightRequest(BaseModel):
     website_url: HttpUrl
 
+    @field_validator('website_url', mode='before')
+    @classmethod
+    def _normalize_website_url(cls, v: Any) -> Any:
+        return normalize_url(v) if isinstance(v, str) else v
+
 class CompetitorAnalysis(BaseModel):
     main_brand: BrandInsights
     competitors: List[BrandInsights] = []
+
+# Shapes of the JSON objects returned by the Groq extraction prompts
+class BrandInfoLLM(BaseModel):
+    brand_name: Optional[str] = None
+    brand_description: Optional[str] = None
+    contact_emails: List[str] = []
+    contact_phones: List[str] = []
+    social_handles: SocialHandles = SocialHandles()
+
+class FAQList(BaseModel):
+    faqs: List[FAQ] = []
+
+class BrandAndFAQsLLM(BaseModel):
+    brand_info: BrandInfoLLM  # Required so a flat brand-only reply fails validation
+    faqs: List[FAQ] = []
+
+class CompetitorList(BaseModel):
+    competitors: List[str] = []
@@ -1,57 +1,97 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Request
+from typing import Dict, Optional
+from redis.asyncio import Redis
 import logging
 import asyncio
 from app.models.schemas import BrandInsights, InsightRequest, CompetitorAnalysis
 from app.services.shopify_scraper import ShopifyScraper
 from app.services.groq_service import GroqService
+from app.services.cache import cached_scrape
+from app.utils.helpers import normalize_url
 
 router = APIRouter(prefix="/api/v1", tags=["insights"])
 
+def get_redis(request: Request) -> Optional[Redis]:
+    """Shared Redis client created at startup (None when caching is disabled)"""
+    return request.app.state.redis
+
+def get_groq(request: Request) -> GroqService:
+    """Shared GroqService created at startup; 503 when GROQ_API_KEY is not configured"""
+    groq_service = request.app.state.groq
+    if groq_service is None:
+        raise HTTPException(status_code=503, detail="GROQ_API_KEY is not configured on the server")
+    return groq_service
+
+def get_scraper(request: Request, groq_service: GroqService = Depends(get_groq)) -> ShopifyScraper:
+    """Scraper bound to the shared GroqService and HTTP session"""
+    return ShopifyScraper(groq_service, request.app.state.http_session)
+
+MAX_COMPETITORS = 2
+COMPETITOR_TIMEOUT = 15.0  # seconds for the whole competitor fan-out
+
+# In-flight /insights scrapes keyed by normalized URL
+_inflight: Dict[str, asyncio.Task] = {}
+
+async def _scrape_insights(url: str, redis: Optional[Redis], scraper: ShopifyScraper) -> BrandInsights:
+    async with scraper:
+        return await cached_scrape(redis, scraper, url)
+
+async def coalesced_scrape(url: str, redis: Optional[Redis], scraper: ShopifyScraper) -> BrandInsights:
+    """Share a single scrape between concurrent requests for the same URL"""
+    task = _inflight.get(url)
+    if task is None:
+        # No await between the lookup and the insert, so this cannot race
+        task = asyncio.create_task(_scrape_insights(url, redis, scraper))
+        _inflight[url] = task
+        task.add_done_callback(lambda _: _inflight.pop(url, None))
+    # Shield so one client disconnecting does not cancel the scrape for the others
+    return await asyncio.shield(task)
+
 @router.post("/insights", response_model=BrandInsights)
-async def get_brand_insights(request: InsightRequest):
+async def get_brand_insights(
+    request: InsightRequest,
+    redis: Optional[Redis] = Depends(get_redis),
+    scraper: ShopifyScraper = Depends(get_scraper)
+):
     try:
-        # URL normalization
+        # Already normalized by InsightRequest
         url = str(request.website_url)
-        if not url.startswith(('http://', 'https://')):
-            url = 'https://' + url
-            
-        logging.info(f"Processing insights request for: {url}")
+
+        logging.info("Processing insights request for: %s", url)
         
-        async with ShopifyScraper() as scraper:
-            insights = await scraper.scrape_shopify_store(url)
-            
-            if insights.status == "error":
-                if "not accessible" in insights.error_message.lower():
-                    raise HTTPException(
-                        status_code=401, 
-                        detail=f"Website '{url}' is not accessible. Please check the URL or try a different Shopify store."
-                    )
-                else:
-                    raise HTTPException(status_code=500, detail=insights.error_message)
-            
-            return insights
+        insights = await coalesced_scrape(url, redis, scraper)
+        
+        if insights.status == "error":
+            if "not accessible" in insights.error_message.lower():
+                raise HTTPException(
+                    status_code=401, 
+                    detail=f"Website '{url}' is not accessible. Please check the URL or try a different Shopify store."
+                )
+            else:
+                raise HTTPException(status_code=500, detail=insights.error_message)
+        
+        return insights
             
     except HTTPException:
         raise
     except Exception as e:
-        logging.error(f"Unexpected error: {str(e)}", exc_info=True)
+        logging.error("Unexpected error: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error occurred")
 
 
 @router.post("/competitor-analysis", response_model=CompetitorAnalysis)
-async def get_competitor_analysis(request: InsightRequest):
+async def get_competitor_analysis(
+    request: InsightRequest,
+    redis: Optional[Redis] = Depends(get_redis),
+    scraper: ShopifyScraper = Depends(get_scraper)
+):
     try:
-        # URL normalization
+        # Already normalized by InsightRequest
         url = str(request.website_url)
-        if not url.startswith(('http://', 'https://')):
-            url = 'https://' + url
-            
-        async with ShopifyScraper() as scraper:
-            groq_service = GroqService()
-            
+
+        async with scraper:
             # Get main brand insights
-            main_insights = await scraper.scrape_shopify_store(url)
+            main_insights = await cached_scrape(redis, scraper, url)
             
             if main_insights.status == "error":
                 if "not accessible" in main_insights.error_message.lower():
@@ -63,27 +103,33 @@ async def get_competitor_analysis(request: InsightRequest):
                     raise HTTPException(status_code=400, detail=main_insights.error_message)
             
             # Find competitors with concurrent fetching
-            competitors_urls = await groq_service.find_competitors(
+            competitors_urls = await scraper.groq_service.find_competitors(
                 main_insights.brand_name or "Unknown Brand"
             )
             
-            async def fetch_competitor(comp_url):
-                if not comp_url.startswith(('http://', 'https://')):
-                    comp_url = 'https://' + comp_url
-                try:
-                    # Add delay between competitor requests
-                    await asyncio.sleep(1)
-                    competitor_data = await scraper.scrape_shopify_store(comp_url)
-                    return competitor_data if competitor_data.status == "success" else None
-                except Exception as ex:
-                    logging.error(f"Failed to fetch competitor {comp_url}: {ex}")
-                    return None
-
-            competitor_tasks = [fetch_competitor(url) for url in competitors_urls[:2]]  # Limit to 2
-            competitor_results = await asyncio.gather(*competitor_tasks)
-            competitor_insights = [c for c in competitor_results if c is not None]
-
-            return CompetitorAnalysis(
+            # Requests to each competitor's host are paced process-wide inside the scraper
+            unique_urls = list(dict.fromkeys(normalize_url(u) for u in competitors_urls))
+            competitor_tasks = [
+                asyncio.create_task(cached_scrape(redis, scraper, comp_url))
+                for comp_url in unique_urls[:MAX_COMPETITORS]
+            ]
+            competitor_insights = []
+            if competitor_tasks:
+                # Keep whatever finished in time; a slow host only loses its own result
+                done, pending = await asyncio.wait(competitor_tasks, timeout=COMPETITOR_TIMEOUT)
+                for task in pending:
+                    task.cancel()
+                # Let the cancelled scrapes unwind before the scraper's session is closed
+                await asyncio.gather(*pending, return_exceptions=True)
+                for comp_url, task in zip(unique_urls, competitor_tasks):
+                    if task not in done:
+                        logging.warning("Competitor %s timed out", comp_url)
+                    elif task.exception() is not None:
+                        logging.error("Failed to fetch competitor %s: %s", comp_url, task.exception())
+                    elif task.result().status == "success":
+                        competitor_insights.append(task.result())
+
+            return CompetitorAnalysis.model_construct(
                 main_brand=main_insights,
                 competitors=competitor_insights
             )
@@ -91,7 +137,7 @@ async def get_competitor_analysis(request: InsightRequest):
     except HTTPException:
         raise
     except Exception as e:
-        logging.error(f"Error in competitor analysis: {str(e)}", exc_info=True)
+        logging.error("Error in competitor analysis: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to perform competitor analysis")
 
 
@@ -0,0 +1,41 @@
+import hashlib
+import logging
+from typing import Optional
+from urllib.parse import urlsplit
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from app.models.schemas import BrandInsights
+from app.services.shopify_scraper import ShopifyScraper
+
+INSIGHTS_TTL = 3600  # seconds
+
+def insights_cache_key(url: str) -> str:
+    """Build the Redis key for a store URL, canonicalized so every endpoint shares it"""
+    parsed = urlsplit(url)
+    canonical = parsed._replace(netloc=parsed.netloc.lower(), path=parsed.path.rstrip('/')).geturl()
+    return "insights:" + hashlib.sha1(canonical.encode()).hexdigest()
+
+async def cached_scrape(redis: Optional[Redis], scraper: ShopifyScraper, url: str) -> BrandInsights:
+    """Return cached insights for url, scraping and caching on a miss"""
+    if redis is None:
+        return await scraper.scrape_shopify_store(url)
+
+    key = insights_cache_key(url)
+    try:
+        raw = await redis.get(key)
+        if raw:
+            logging.info("Cache hit for %s", url)
+            return BrandInsights.model_validate_json(raw)
+    except RedisError as e:
+        logging.warning("Redis GET failed for %s: %s", url, e)
+
+    insights = await scraper.scrape_shopify_store(url)
+
+    # Only successful scrapes are cached so transient failures are retried
+    if insights.status == "success":
+        try:
+            await redis.set(key, insights.model_dump_json(), ex=INSIGHTS_TTL)
+        except RedisError as e:
+            logging.warning("Redis SET failed for %s: %s", url, e)
+
+    return insights
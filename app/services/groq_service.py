@@ -1,113 +1,352 @@
 import os
-from groq import Groq
-from typing import Dict, List, Any, Optional
-import json
+import re
+import asyncio
+import hashlib
+import httpx
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from selectolax.lexbor import LexborHTMLParser
+from groq import AsyncGroq, GroqError
+from typing import Dict, List, Any, Optional, Tuple
+from pydantic import ValidationError
 import logging
+from app.models.schemas import BrandInfoLLM, FAQList, CompetitorList, BrandAndFAQsLLM
+
+LLM_TIMEOUT = 10  # seconds per Groq completion
+COMPETITORS_TTL = 86400  # seconds
+BRAND_INFO_TTL = 86400  # seconds; keyed by page content, so stale entries are never served
+
+# Failures that degrade to an empty result; anything else (incl. cancellation) propagates
+LLM_ERRORS = (GroqError, httpx.HTTPError, asyncio.TimeoutError)
+
+# Prompt templates, filled with str.format
+_BRAND_PROMPT = """
+Analyze the following page content from {url} and extract brand information.
+Return a JSON object with the following structure:
+{{
+    "brand_name": "extracted brand name",
+    "brand_description": "about the brand text",
+    "contact_emails": ["email1", "email2"],
+    "contact_phones": ["phone1", "phone2"],
+    "social_handles": {{
+        "instagram": "instagram_handle",
+        "facebook": "facebook_url",
+        "twitter": "twitter_handle",
+        "tiktok": "tiktok_handle",
+        "youtube": "youtube_url",
+        "linkedin": "linkedin_url"
+    }}
+}}
+
+Page Content (first 8000 chars):
+{content}
+"""
+
+_FAQ_PROMPT = """
+Extract all FAQ questions and answers from the following page content.
+Return a JSON object with this structure:
+{{
+    "faqs": [
+        {{"question": "Do you have COD?", "answer": "Yes, we offer Cash on Delivery"}},
+        {{"question": "What is your return policy?", "answer": "30 days return policy"}}
+    ]
+}}
+
+Page Content (first 6000 chars):
+{content}
+"""
+
+_ALL_PROMPT = """
+Analyze the following page content from {url}. Extract the brand information and
+any FAQ questions and answers it contains.
+Return a JSON object with the following structure:
+{{
+    "brand_info": {{
+        "brand_name": "extracted brand name",
+        "brand_description": "about the brand text",
+        "contact_emails": ["email1", "email2"],
+        "contact_phones": ["phone1", "phone2"],
+        "social_handles": {{
+            "instagram": "instagram_handle",
+            "facebook": "facebook_url",
+            "twitter": "twitter_handle",
+            "tiktok": "tiktok_handle",
+            "youtube": "youtube_url",
+            "linkedin": "linkedin_url"
+        }}
+    }},
+    "faqs": [
+        {{"question": "Do you have COD?", "answer": "Yes, we offer Cash on Delivery"}}
+    ]
+}}
+If no FAQs are found, return an empty "faqs" array.
+
+Page Content (first 8000 chars):
+{content}
+"""
+
+_COMPETITOR_PROMPT = """
+Given the brand name "{brand_name}" {industry_clause}, 
+suggest 3-5 main competitor websites. Return only the website URLs in JSON format:
+{{"competitors": ["competitor1.com", "competitor2.com", "competitor3.com"]}}
+
+Focus on direct competitors that are likely to have Shopify stores.
+"""
+
+# Link targets worth keeping when HTML is reduced to text (contacts and socials)
+_CONTACT_HREF_RE = re.compile(
+    r'^(?:mailto:|tel:)|(?:^|[/.])(?:instagram|facebook|twitter|x|tiktok|youtube|linkedin)\.com/',
+    re.IGNORECASE
+)
+
+def distill_page(html_content: str) -> str:
+    """Reduce HTML to title, description/og meta, contact links and visible body text"""
+    return distill_tree(LexborHTMLParser(html_content))
+
+def distill_tree(tree: LexborHTMLParser) -> str:
+    """distill_page for an already parsed page; strips scripts and styles from tree in place"""
+    parts = []
+
+    title = tree.css_first('title')
+    if title is not None:
+        parts.append(f"Title: {title.text(strip=True)}")
+    for meta in tree.css('meta[name="description"], meta[property^="og:"]'):
+        key = meta.attributes.get('name') or meta.attributes.get('property')
+        value = meta.attributes.get('content')
+        if value:
+            parts.append(f"{key}: {value}")
+
+    links = dict.fromkeys(
+        href for href in (a.attributes.get('href') for a in tree.css('a[href]'))
+        if href and _CONTACT_HREF_RE.search(href)
+    )
+    if links:
+        parts.append("Links: " + ' '.join(links))
+
+    tree.strip_tags(['script', 'style', 'noscript', 'svg', 'template'])
+    body = tree.body
+    if body is not None:
+        parts.append(body.text(separator=' '))
+
+    return re.sub(r'\s+', ' ', ' '.join(parts)).strip()
+
+def _brand_info_key(url: str, content: str) -> str:
+    """Cache key for brand info extracted from reduced page content"""
+    return "brand_info:" + hashlib.sha1(f"{url}\n{content}".encode()).hexdigest()
+
+def _has_brand_info(brand_info: Dict[str, Any]) -> bool:
+    """True when at least one extracted field is set; all-None replies are not worth caching"""
+    return any(
+        any(value.values()) if isinstance(value, dict) else value
+        for value in brand_info.values()
+    )
 
 class GroqService:
-    def __init__(self):
-        self.client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+    def __init__(self, client: Optional[AsyncGroq] = None, redis: Optional[Redis] = None):
+        self.client = client or AsyncGroq(api_key=os.getenv("GROQ_API_KEY"))
+        self.redis = redis
         self.model = "meta-llama/llama-4-scout-17b-16e-instruct"
+
+    async def _cache_get(self, key: str) -> Any:
+        """Return the cached JSON value for key, or None on miss or when caching is disabled"""
+        if self.redis is None:
+            return None
+        try:
+            raw = await self.redis.get(key)
+            return orjson.loads(raw) if raw else None
+        except (RedisError, orjson.JSONDecodeError) as e:
+            logging.warning("Redis GET failed for %s: %s", key, e)
+            return None
+
+    async def _cache_set(self, key: str, value: Any, ttl: int):
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(key, orjson.dumps(value), ex=ttl)
+        except RedisError as e:
+            logging.warning("Redis SET failed for %s: %s", key, e)
         
-    async def extract_brand_info(self, html_content: str, url: str) -> Dict[str, Any]:
-        """Extract brand information from HTML content using Groq"""
+    async def _stream_json_object(self, **kwargs) -> str:
+        """Stream a completion and stop reading once its outer JSON object closes"""
+        # Groq's JSON mode does not support streaming, so the prompt alone asks for JSON
+        stream = await self.client.chat.completions.create(stream=True, **kwargs)
+        parts: List[str] = []
+        depth = 0
+        in_string = escaped = False
         try:
-            prompt = f"""
-            Analyze the following HTML content from {url} and extract brand information.
-            Return a JSON object with the following structure:
-            {{
-                "brand_name": "extracted brand name",
-                "brand_description": "about the brand text",
-                "contact_emails": ["email1", "email2"],
-                "contact_phones": ["phone1", "phone2"],
-                "social_handles": {{
-                    "instagram": "instagram_handle",
-                    "facebook": "facebook_url",
-                    "twitter": "twitter_handle",
-                    "tiktok": "tiktok_handle",
-                    "youtube": "youtube_url",
-                    "linkedin": "linkedin_url"
-                }}
-            }}
-
-            HTML Content (first 8000 chars):
-            {html_content[:8000]}
-            """
-            
-            response = self.client.chat.completions.create(
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                for i, ch in enumerate(delta):
+                    if in_string:
+                        if escaped:
+                            escaped = False
+                        elif ch == '\\':
+                            escaped = True
+                        elif ch == '"':
+                            in_string = False
+                    elif ch == '"':
+                        in_string = depth > 0
+                    elif ch == '{':
+                        depth += 1
+                    elif ch == '}' and depth:
+                        depth -= 1
+                        if depth == 0:
+                            parts.append(delta[:i + 1])
+                            text = ''.join(parts)
+                            return text[text.index('{'):]
+                parts.append(delta)
+        finally:
+            # Closing the response early stops token generation on our side
+            await stream.response.aclose()
+        return ""
+
+    async def extract_brand_info(self, page_text: str, url: str) -> Dict[str, Any]:
+        """Extract brand information from distill_page output using Groq"""
+        try:
+            content = page_text[:8000]
+            cache_key = _brand_info_key(url, content)
+            cached = await self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+
+            brand_info = await self._extract_brand_info(content, url)
+            if _has_brand_info(brand_info):
+                await self._cache_set(cache_key, brand_info, BRAND_INFO_TTL)
+            return brand_info
+
+        except ValidationError:
+            logging.error("Failed to parse JSON from Groq response")
+            return {}
+        except LLM_ERRORS as e:
+            logging.error("Groq API error: %s", e)
+            return {}
+
+    async def _extract_brand_info(self, content: str, url: str) -> Dict[str, Any]:
+        """Run the brand info prompt against already-reduced page content"""
+        prompt = _BRAND_PROMPT.format(url=url, content=content)
+
+        messages = [
+            {"role": "system", "content": "You are an expert at extracting brand information from websites. Always return valid JSON."},
+            {"role": "user", "content": prompt}
+        ]
+
+        # Stream and stop as soon as the object closes; fall back to JSON mode on bad output
+        try:
+            result = await asyncio.wait_for(self._stream_json_object(
+                messages=messages,
+                model=self.model,
+                temperature=0.1,
+                max_tokens=2000
+            ), timeout=LLM_TIMEOUT)
+            return BrandInfoLLM.model_validate_json(result).model_dump()
+        except ValidationError:
+            logging.info("Streamed brand info was not valid JSON, retrying in JSON mode")
+
+        response = await asyncio.wait_for(self.client.chat.completions.create(
+            messages=messages,
+            model=self.model,
+            temperature=0.1,
+            max_tokens=2000,
+            response_format={"type": "json_object"}
+        ), timeout=LLM_TIMEOUT)
+        
+        result = response.choices[0].message.content
+        return BrandInfoLLM.model_validate_json(result).model_dump()
+
+    async def extract_all(self, page_text: str, url: str) -> Tuple[Dict[str, Any], List[Dict[str, str]]]:
+        """Extract brand info and FAQs from the same distilled page with one combined prompt"""
+        content = page_text[:8000]
+        cache_key = _brand_info_key(url, content)
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            # Brand info is already known, so only the FAQ prompt is left to run
+            return cached, await self.extract_faqs(page_text)
+
+        try:
+            response = await asyncio.wait_for(self.client.chat.completions.create(
                 messages=[
-                    {"role": "system", "content": "You are an expert at extracting brand information from websites. Always return valid JSON."},
-                    {"role": "user", "content": prompt}
+                    {"role": "system", "content": "You are an expert at extracting brand information and FAQs from websites. Always return valid JSON."},
+                    {"role": "user", "content": _ALL_PROMPT.format(url=url, content=content)}
                 ],
                 model=self.model,
                 temperature=0.1,
-                max_tokens=2000
+                max_tokens=3000,
+                response_format={"type": "json_object"}
+            ), timeout=LLM_TIMEOUT)
+
+            result = BrandAndFAQsLLM.model_validate_json(response.choices[0].message.content)
+        except ValidationError:
+            logging.info("Combined extraction did not match the schema, using separate prompts")
+            brand_info, faqs = await asyncio.gather(
+                self.extract_brand_info(page_text, url),
+                self.extract_faqs(page_text)
             )
-            
-            result = response.choices[0].message.content
-            return json.loads(result)
-            
-        except json.JSONDecodeError:
-            logging.error("Failed to parse JSON from Groq response")
-            return {}
-        except Exception as e:
-            logging.error(f"Groq API error: {str(e)}")
-            return {}
+            return brand_info, faqs
+        except LLM_ERRORS as e:
+            logging.error("Groq API error: %s", e)
+            return {}, []
 
-    async def extract_faqs(self, html_content: str) -> List[Dict[str, str]]:
-        """Extract FAQs from HTML content"""
+        brand_info = result.brand_info.model_dump()
+        if _has_brand_info(brand_info):
+            await self._cache_set(cache_key, brand_info, BRAND_INFO_TTL)
+        return brand_info, [faq.model_dump() for faq in result.faqs]
+
+    async def extract_faqs(self, page_text: str) -> List[Dict[str, str]]:
+        """Extract FAQs from distill_page output"""
         try:
-            prompt = f"""
-            Extract all FAQ questions and answers from the following HTML content.
-            Return a JSON array with this structure:
-            [
-                {{"question": "Do you have COD?", "answer": "Yes, we offer Cash on Delivery"}},
-                {{"question": "What is your return policy?", "answer": "30 days return policy"}}
-            ]
-
-            HTML Content (first 6000 chars):
-            {html_content[:6000]}
-            """
+            prompt = _FAQ_PROMPT.format(content=page_text[:6000])
             
-            response = self.client.chat.completions.create(
+            response = await asyncio.wait_for(self.client.chat.completions.create(
                 messages=[
-                    {"role": "system", "content": "Extract FAQ information and return as JSON array. If no FAQs found, return empty array."},
+                    {"role": "system", "content": "Extract FAQ information and return it as a JSON object with a \"faqs\" array. If no FAQs found, return an empty array."},
                     {"role": "user", "content": prompt}
                 ],
                 model=self.model,
                 temperature=0.1,
-                max_tokens=1500
-            )
+                max_tokens=1500,
+                response_format={"type": "json_object"}
+            ), timeout=LLM_TIMEOUT)
             
-            result = response.choices.message.content
-            return json.loads(result)
+            result = response.choices[0].message.content
+            return [faq.model_dump() for faq in FAQList.model_validate_json(result).faqs]
             
-        except:
+        except (ValidationError, *LLM_ERRORS) as e:
+            logging.warning("FAQ extraction failed: %s", e)
             return []
 
     async def find_competitors(self, brand_name: str, industry: str = "") -> List[str]:
         """Find competitor websites for a brand"""
         try:
-            prompt = f"""
-            Given the brand name "{brand_name}" {f"in {industry} industry" if industry else ""}, 
-            suggest 3-5 main competitor websites. Return only the website URLs in JSON format:
-            ["competitor1.com", "competitor2.com", "competitor3.com"]
-            
-            Focus on direct competitors that are likely to have Shopify stores.
-            """
+            cache_key = f"competitors:{brand_name.lower().strip()}:{industry}"
+            cached = await self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+
+            prompt = _COMPETITOR_PROMPT.format(
+                brand_name=brand_name,
+                industry_clause=f"in {industry} industry" if industry else ""
+            )
             
-            response = self.client.chat.completions.create(
+            response = await asyncio.wait_for(self.client.chat.completions.create(
                 messages=[
-                    {"role": "system", "content": "You are a market research expert. Return only competitor website URLs in JSON array format."},
+                    {"role": "system", "content": "You are a market research expert. Return only competitor website URLs as a JSON object with a \"competitors\" array."},
                     {"role": "user", "content": prompt}
                 ],
                 model=self.model,
                 temperature=0.3,
-                max_tokens=500
-            )
+                max_tokens=500,
+                response_format={"type": "json_object"}
+            ), timeout=LLM_TIMEOUT)
             
             result = response.choices[0].message.content
-            return json.loads(result)
+            competitors = CompetitorList.model_validate_json(result).competitors
+            if competitors:
+                await self._cache_set(cache_key, competitors, COMPETITORS_TTL)
+            return competitors
             
-        except:
+        except (ValidationError, *LLM_ERRORS) as e:
+            logging.warning("Competitor lookup failed for %s: %s", brand_name, e)
             return []
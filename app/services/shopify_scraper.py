@@ -1,14 +1,169 @@
 import aiohttp
 import asyncio
-from bs4 import BeautifulSoup
-from typing import List, Dict, Any, Tuple
-from urllib.parse import urljoin
+import orjson
+import os
+import weakref
+from cachetools import TTLCache
+from selectolax.lexbor import LexborHTMLParser
+from typing import List, Dict, Any, Tuple, Optional, Callable, Awaitable
+from urllib.parse import urljoin, urlparse
 import re
 import logging
 from app.models.schemas import ProductSchema, BrandInsights, ContactInfo, SocialHandles, PolicyInfo, FAQ
-from app.services.groq_service import GroqService
+from app.services.groq_service import GroqService, distill_page, distill_tree
+from app.utils.helpers import normalize_url, extract_social_handle, extract_social_handles
+from app.utils.rate_limit import AsyncTokenBucket
 import random
 
+PRODUCTS_PAGE_SIZE = 250  # Shopify's products.json maximum
+MAX_RESPONSE_BYTES = 5_000_000  # Larger pages are skipped rather than downloaded
+PARSE_OFFLOAD_THRESHOLD = 500  # Catalogs larger than this are parsed off the event loop
+VARIANT_FIELDS = ('id', 'title', 'price', 'available')  # Variant keys kept on ProductSchema
+
+LINK_PATTERNS = {
+    'Contact Us': ['/pages/contact', '/contact', '/contact-us'],
+    'About Us': ['/pages/about', '/about', '/about-us'],
+    'Order Tracking': ['/account/login', '/track', '/tracking'],
+    'Blog': ['/blogs', '/blog'],
+    'Support': ['/pages/support', '/support', '/help'],
+    'Size Guide': ['/pages/size-guide', '/size-guide'],
+    'FAQ': ['/pages/faq', '/faq', '/pages/frequently-asked-questions']
+}
+
+# One combined regex per category, compiled once and shared by every scrape
+_LINK_PATTERNS = {
+    name: re.compile('|'.join(patterns), re.IGNORECASE)
+    for name, patterns in LINK_PATTERNS.items()
+}
+
+# Product handle in a storefront link, e.g. /collections/x/products/<handle>?variant=1
+_PRODUCT_HREF_RE = re.compile(r'/products/([^/?#]+)')
+
+# Case-insensitive scan without copying the page; also matches cdn.shopify.com
+_SHOPIFY_MARKER_RE = re.compile(r'shopify', re.IGNORECASE)
+# Shopify themes reference the CDN in <head>, which with inline styles and JSON-LD can run
+# to tens of KB; a miss only costs the limit=1 probe
+MARKER_SCAN_CHARS = 64 * 1024
+
+def _parse_homepage(html: str) -> Tuple[List[str], List[str], str]:
+    """Return anchor hrefs, script srcs (in document order) and distilled text from a single parse"""
+    tree = LexborHTMLParser(html)
+    hrefs = [href for href in (node.attributes.get('href') for node in tree.css('a[href]')) if href]
+    srcs = [src for src in (node.attributes.get('src') for node in tree.css('script[src]')) if src]
+    # distill_tree strips <script> from the tree, so the links are collected first
+    return hrefs, srcs, distill_tree(tree)
+
+# Shared scraping state below is only touched from the event loop and uses asyncio
+# primitives. Entries are created with no await between lookup and insert, so
+# lazy creation cannot race and needs no lock of its own.
+
+PAGE_CACHE_CHARS = 64 * 1024 * 1024  # Per-process budget for memoized page bodies, in characters
+
+# Process-wide memo of successful page fetches keyed by url, bounded by total body length
+_PAGE_CACHE: TTLCache = TTLCache(maxsize=PAGE_CACHE_CHARS, ttl=3600, getsizeof=lambda result: len(result[0]))
+# Process-wide memo of HEAD probe statuses keyed by url
+_PROBE_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=3600)
+# One lock per (method, url) while it is being fetched, so concurrent misses share a request
+_CACHE_LOCKS: "weakref.WeakValueDictionary[Tuple[str, str], asyncio.Lock]" = weakref.WeakValueDictionary()
+
+async def _cached(cache: TTLCache, method: str, url: str, fetch: Callable[[], Awaitable[Any]],
+                  cacheable: Callable[[Any], bool]) -> Any:
+    """Return the memoized result for url, running fetch at most once per miss"""
+    result = cache.get(url)
+    if result is not None:
+        return result
+    lock = _CACHE_LOCKS.get((method, url))
+    if lock is None:
+        lock = _CACHE_LOCKS[(method, url)] = asyncio.Lock()
+    async with lock:
+        result = cache.get(url)
+        if result is None:
+            result = await fetch()
+            if cacheable(result):
+                try:
+                    cache[url] = result
+                except ValueError:  # Larger than the whole byte budget
+                    pass
+        return result
+
+# Short budget for existence probes; the session default covers pages and products.json
+PROBE_TIMEOUT = aiohttp.ClientTimeout(total=5, connect=2)
+
+# Every limit below is enforced per worker process, so the per-store budget is split
+# across the WEB_CONCURRENCY workers that uvicorn (and run.py) start
+WORKERS = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+
+PER_HOST_LIMIT = max(1, 8 // WORKERS)  # Max in-flight requests to one store from this worker
+# Request slots per host; a host's semaphore lives only while someone holds or awaits it
+_HOST_SLOTS: "weakref.WeakValueDictionary[str, asyncio.Semaphore]" = weakref.WeakValueDictionary()
+
+def _host_slot(url: str) -> asyncio.Semaphore:
+    """Semaphore pacing requests to url's host above the connection pool"""
+    host = urlparse(url).netloc.lower()
+    sem = _HOST_SLOTS.get(host)
+    if sem is None:
+        sem = _HOST_SLOTS[host] = asyncio.Semaphore(PER_HOST_LIMIT)
+    return sem
+
+# Per-host request pacing; buckets are dropped after 600s without use
+HOST_RATE = 5 / WORKERS  # requests per second from this worker
+HOST_BURST = max(1, 10 // WORKERS)
+_HOST_BUCKETS: TTLCache = TTLCache(maxsize=4096, ttl=600)
+
+def _host_bucket(url: str) -> AsyncTokenBucket:
+    """Token bucket pacing requests to url's host"""
+    host = urlparse(url).netloc.lower()
+    bucket = _HOST_BUCKETS.get(host)
+    if bucket is None:
+        bucket = AsyncTokenBucket(rate=HOST_RATE, burst=HOST_BURST)
+    # Re-inserting restarts the TTL, so a bucket only expires after 600s without use,
+    # by which point it has long refilled to a full burst anyway
+    _HOST_BUCKETS[host] = bucket
+    return bucket
+
+# Statuses worth retrying; anything else that is not a 200 is returned immediately
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Exponential backoff parameters, in seconds
+RETRY_BASE = 1.0
+RETRY_CAP = 30.0
+RETRY_JITTER = 1.0
+
+def _backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Seconds to wait before the next attempt; honours a numeric Retry-After"""
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), RETRY_CAP)
+    # Jitter decorrelates retries from concurrent scrapes of the same store
+    return min(RETRY_CAP, RETRY_BASE * 2 ** attempt) + random.uniform(0, RETRY_JITTER)
+
+def create_session() -> aiohttp.ClientSession:
+    """Build the scraping HTTP session; meant to be shared process-wide"""
+    return aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=20, connect=10),
+        connector=aiohttp.TCPConnector(
+            limit=0,  # No global cap; stores are throttled per host instead
+            limit_per_host=PER_HOST_LIMIT,
+            ttl_dns_cache=300,
+            use_dns_cache=True,
+            keepalive_timeout=60,
+            enable_cleanup_closed=True
+        ),
+        # Brotli decoding comes from aiohttp[speedups]; applies to products.json too
+        headers={'Accept-Encoding': 'gzip, deflate, br'}
+    )
+
+def _to_faqs(faqs_data: List[Dict[str, str]]) -> List[FAQ]:
+    """Build FAQ models from LLM output, dropping incomplete entries"""
+    return [FAQ(question=faq.get('question', ''), answer=faq.get('answer', ''))
+            for faq in faqs_data if faq.get('question') and faq.get('answer')]
+
+# Browser-like headers for page fetches; Accept-Encoding comes from the session
+_BASE_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Upgrade-Insecure-Requests': '1'
+}
+
 class ShopifyScraper:
     user_agents = [
         'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/112.0.0.0 Safari/537.36',
@@ -16,88 +171,191 @@ class ShopifyScraper:
         'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/109.0.0.0 Safari/537.36',
     ]
 
-    def __init__(self):
-        self.groq_service = GroqService()
-        self.session = None
+    fetch_attempts = 3
+    rate_limited_attempts = 5  # 429s are transient, so they get more tries
+
+    def __init__(self, groq_service: Optional[GroqService] = None, session: Optional[aiohttp.ClientSession] = None):
+        self.groq_service = groq_service or GroqService()
+        # A shared session is borrowed; one is only created (and closed) when none is given
+        self.session = session
+        self._owns_session = session is None
+        # One browser identity for the whole scrape; the headers are built once and reused
+        self.user_agent = random.choice(self.user_agents)
+        self._ua_headers = {'User-Agent': self.user_agent}
+        self._page_headers = {**_BASE_HEADERS, **self._ua_headers}
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=20, connect=10),
-            connector=aiohttp.TCPConnector(limit=10, ttl_dns_cache=300, use_dns_cache=True)
-        )
+        if self.session is None:
+            self.session = create_session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
+        if self._owns_session and self.session:
             await self.session.close()
 
-    async def fetch_url(self, url: str) -> Tuple[str, int]:
-        """Fetch URL content with retries, randomized User-Agent and 429 handling"""
-        for attempt in range(3):
-            headers = {
-                'User-Agent': random.choice(self.user_agents),
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1'
-            }
+    async def fetch_url(
+        self, url: str, timeout: Optional[aiohttp.ClientTimeout] = None, retry: bool = True
+    ) -> Tuple[str, int]:
+        """Fetch URL content, served from the process-wide cache when warm"""
+        # Only 200s are memoized; a 403 bot-block or an error must not stick for an hour
+        return await _cached(
+            _PAGE_CACHE, 'GET', url, lambda: self._fetch_url(url, timeout, retry), lambda result: result[1] == 200
+        )
+
+    async def _fetch_url(self, url: str, timeout: Optional[aiohttp.ClientTimeout], retry: bool) -> Tuple[str, int]:
+        """Fetch URL content with bounded concurrency, retries and backoff"""
+        attempt = 0
+        while True:
+            status = None
+            retry_after = None
             try:
-                async with self.session.get(url, headers=headers) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        return html, response.status
-                    elif response.status == 429:
-                        logging.warning(f"429 Too Many Requests for {url}, backing off.")
-                        await asyncio.sleep(5 * (attempt + 1))  # Exponential backoff
-                        continue
-                    else:
-                        logging.warning(f"Attempt {attempt+1} - HTTP {response.status} for {url}")
-                        await asyncio.sleep(2)
-            except Exception as e:
-                logging.warning(f"Attempt {attempt+1} - Error fetching {url}: {str(e)}")
-                await asyncio.sleep(2)
-
-        logging.error(f"Failed to fetch {url} after 3 attempts")
-        return "", 500
+                # Only the request holds a slot; backoff sleeps happen outside it
+                await _host_bucket(url).acquire()
+                async with _host_slot(url):
+                    # timeout=None would disable timeouts entirely, so fall back to the session's
+                    async with self.session.get(
+                        url, headers=self._page_headers, timeout=timeout or self.session.timeout
+                    ) as response:
+                        status = response.status
+                        if (response.content_length or 0) > MAX_RESPONSE_BYTES:
+                            logging.warning("Skipping %s: %s bytes", url, response.content_length)
+                            return "", 413
+                        if status == 200:
+                            html = await response.text(errors='replace')
+                            return html, status
+                        if status not in RETRYABLE_STATUSES:
+                            # Permanent answers such as 404 or 403 will not change on retry
+                            return "", status
+                        retry_after = response.headers.get('Retry-After')
+                logging.warning("Attempt %s - HTTP %s for %s", attempt + 1, status, url)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logging.warning("Attempt %s - Error fetching %s: %s", attempt + 1, url, e)
+
+            attempt += 1
+            if not retry or attempt >= (self.rate_limited_attempts if status == 429 else self.fetch_attempts):
+                break
+            await asyncio.sleep(_backoff_delay(attempt - 1, retry_after))
+
+        logging.error("Failed to fetch %s after %s attempts", url, attempt)
+        return "", status or 500
+
+    async def head_url(self, url: str) -> int:
+        """Return the status of url without downloading its body"""
+        # A page already fetched with GET (e.g. /pages/faq) answers the probe for free
+        fetched = _PAGE_CACHE.get(url)
+        if fetched is not None:
+            return fetched[1]
+        # Server errors and rate limits are transient, so they are never memoized
+        return await _cached(
+            _PROBE_CACHE, 'HEAD', url, lambda: self._head_url(url), lambda status: status < 500 and status != 429
+        )
+
+    async def _head_url(self, url: str) -> int:
+        await _host_bucket(url).acquire()
+        async with _host_slot(url):
+            async with self.session.head(url, headers=self._page_headers, allow_redirects=True, timeout=PROBE_TIMEOUT) as response:
+                if response.status != 405:
+                    return response.status
+            # Some servers reject HEAD; a one-byte ranged GET is the next cheapest probe
+            async with self.session.get(url, headers={**self._page_headers, 'Range': 'bytes=0-0'}, timeout=PROBE_TIMEOUT) as response:
+                return 200 if response.status == 206 else response.status
+
+    async def _fetch_page(self, base_url: str, page: int) -> Optional[List[Dict[str, Any]]]:
+        """Fetch one products.json page; None when the page is missing or fails"""
+        url = f"{base_url.rstrip('/')}/products.json?limit={PRODUCTS_PAGE_SIZE}&page={page}"
+        try:
+            await _host_bucket(url).acquire()
+            async with _host_slot(url), self.session.get(url, headers=self._ua_headers) as response:
+                if response.status != 200:
+                    return None
+                # orjson parses the raw bytes directly, skipping charset decoding
+                data = orjson.loads(await response.read())
+                return data.get('products', [])
+        except Exception as e:
+            logging.error("Error fetching products page %s: %s", page, e)
+            return None
+
+    async def _is_shopify(self, base_url: str) -> bool:
+        """Confirm a Shopify storefront with a single one-product request"""
+        url = urljoin(base_url, '/products.json?limit=1&page=1')
+        try:
+            await _host_bucket(url).acquire()
+            async with _host_slot(url), self.session.get(url, headers=self._ua_headers, timeout=PROBE_TIMEOUT) as response:
+                if response.status != 200:
+                    return False
+                return 'products' in orjson.loads(await response.read())
+        except (aiohttp.ClientError, asyncio.TimeoutError, orjson.JSONDecodeError) as e:
+            logging.warning("Shopify probe failed for %s: %s", base_url, e)
+            return False
 
     async def get_products_json(self, base_url: str) -> List[Dict[str, Any]]:
-        """Fetch products from /products.json endpoint"""
+        """Fetch products from /products.json, requesting pages speculatively in batches"""
         products = []
         page = 1
+        batch = 4
 
         while True:
-            url = f"{base_url.rstrip('/')}/products.json?limit=250&page={page}"
-            try:
-                async with self.session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        page_products = data.get('products', [])
-                        if not page_products:
-                            break
-                        products.extend(page_products)
-                        page += 1
-                        if len(page_products) < 250:  # Last page
-                            break
-                    else:
-                        break
-            except Exception as e:
-                logging.error(f"Error fetching products page {page}: {str(e)}")
-                break
-
-        return products
+            pages = await asyncio.gather(*(self._fetch_page(base_url, p) for p in range(page, page + batch)))
+            # Merge in page order and stop at the first missing, empty or short page
+            for page_products in pages:
+                if not page_products:
+                    return products
+                products.extend(page_products)
+                if len(page_products) < PRODUCTS_PAGE_SIZE:  # Last page
+                    return products
+            page += batch
+            # Pages beyond the host's slots would only queue, and overshoot the last page
+            batch = min(batch * 2, PER_HOST_LIMIT)
 
     def parse_product(self, product_data: Dict[str, Any]) -> ProductSchema:
+        """Parse product data into ProductSchema, taking the fast path for well-formed entries"""
+        try:
+            return self._parse_product_fast(product_data)
+        except (KeyError, TypeError, AttributeError):
+            return self._parse_product_defensive(product_data)
+
+    def _parse_product_fast(self, product_data: Dict[str, Any]) -> ProductSchema:
+        """Parse an entry shaped like Shopify's products.json; raises on anything unexpected"""
+        variants = [
+            {key: variant[key] for key in VARIANT_FIELDS if key in variant}
+            for variant in product_data['variants']
+        ]
+        tags = product_data['tags']
+        if not isinstance(tags, list):  # Comma-separated strings go through the defensive path
+            raise TypeError("tags is not a list")
+
+        # Same normalized shape as the defensive path, so skip re-validation
+        return ProductSchema.model_construct(
+            id=str(product_data['id']),
+            title=product_data['title'] or '',
+            handle=product_data['handle'] or '',
+            price=str(variants[0].get('price', '0')) if variants else None,
+            available=any(variant.get('available', False) for variant in variants),
+            images=[img['src'] for img in product_data['images'] if 'src' in img],
+            variants=variants,
+            tags=[str(tag) for tag in tags],
+            vendor=product_data.get('vendor') or '',
+            product_type=product_data.get('product_type') or '',
+            description=product_data.get('body_html') or ''
+        )
+
+    def _parse_product_defensive(self, product_data: Dict[str, Any]) -> ProductSchema:
         """Parse product data into ProductSchema with defensive programming"""
         try:
             images = []
             if 'images' in product_data and isinstance(product_data['images'], list):
                 images = [img.get('src', '') for img in product_data['images'] if isinstance(img, dict)]
 
-            variants = product_data.get('variants', [])
-            price = None
-            if variants and isinstance(variants, list):
-                price = str(variants[0].get('price', '0'))
+            raw_variants = product_data.get('variants') or []
+            if not isinstance(raw_variants, list):
+                raw_variants = []
+            # Keep only the fields clients use instead of every raw variant dict
+            variants = [
+                {key: variant[key] for key in VARIANT_FIELDS if key in variant}
+                for variant in raw_variants if isinstance(variant, dict)
+            ]
+            price = str(variants[0].get('price', '0')) if variants else None
+            available = any(variant.get('available', False) for variant in variants)
 
             tags = []
             if 'tags' in product_data:
@@ -106,37 +364,45 @@ class ShopifyScraper:
                 elif isinstance(product_data['tags'], list):
                     tags = [str(tag) for tag in product_data['tags']]
 
-            return ProductSchema(
+            # Fields are normalized above, so skip re-validation
+            return ProductSchema.model_construct(
                 id=str(product_data.get('id', '')),
                 title=product_data.get('title', '') or '',
                 handle=product_data.get('handle', '') or '',
                 price=price,
-                available=any(variant.get('available', False) for variant in variants if isinstance(variant, dict)),
+                available=available,
                 images=images,
-                variants=variants if isinstance(variants, list) else [],
+                variants=variants,
                 tags=tags,
                 vendor=product_data.get('vendor', '') or '',
                 product_type=product_data.get('product_type', '') or '',
                 description=product_data.get('body_html', '') or ''
             )
         except Exception as e:
-            logging.error(f"Error parsing product: {str(e)}", exc_info=True)
-            return ProductSchema(title="Parse Error", handle="error")
+            # Tracebacks are costly per bad product, so only format them when debugging
+            logging.warning(
+                "Error parsing product id=%s: %s", product_data.get('id'), e,
+                exc_info=logging.getLogger().isEnabledFor(logging.DEBUG)
+            )
+            return ProductSchema(title="Parse Error", handle="error", available=False)
+
+    def parse_products(self, products_data: List[Dict[str, Any]]) -> List[ProductSchema]:
+        """Parse a whole products.json catalog in one pass"""
+        parse = self.parse_product
+        return [parse(product) for product in products_data]
 
-    async def extract_hero_products(self, html: str, all_products: List[ProductSchema]) -> List[ProductSchema]:
-        """Extract hero products from homepage"""
+    async def extract_hero_products(self, hrefs: List[str], all_products: List[ProductSchema]) -> List[ProductSchema]:
+        """Extract hero products from the homepage's anchor hrefs"""
         try:
-            soup = BeautifulSoup(html, 'html.parser')
             hero_products = []
 
-            product_links = soup.find_all('a', href=re.compile(r'/products/'))
             product_handles = set()
-
-            for link in product_links[:10]:
-                href = link.get('href', '')
-                if '/products/' in href:
-                    handle = href.split('/products/')[-1].split('?')[0].split('#')
-                    product_handles.add(handle)
+            for href in hrefs:
+                match = _PRODUCT_HREF_RE.search(href)
+                if match:
+                    product_handles.add(match.group(1))
+                    if len(product_handles) >= 10:
+                        break
 
             for product in all_products:
                 if product.handle in product_handles:
@@ -146,9 +412,36 @@ class ShopifyScraper:
 
             return hero_products
         except Exception as e:
-            logging.error(f"Error extracting hero products: {str(e)}")
+            logging.error("Error extracting hero products: %s", e)
             return []
 
+    def fetch_faq_page(self, base_url: str) -> asyncio.Task:
+        """Start fetching the FAQ page; one attempt, since brand extraction waits on the answer"""
+        return asyncio.create_task(
+            self.fetch_url(urljoin(base_url, '/pages/faq'), timeout=PROBE_TIMEOUT, retry=False)
+        )
+
+    async def extract_brand_and_faqs(
+        self, base_url: str, page_text: str, faq_page: Awaitable[Tuple[str, int]]
+    ) -> Tuple[Dict[str, Any], List[FAQ]]:
+        """Extract brand info from the distilled homepage and FAQs from the FAQ page or homepage"""
+        faq_html, faq_status = await faq_page
+        if faq_html:
+            brand_info, faqs_data = await asyncio.gather(
+                self.groq_service.extract_brand_info(page_text, base_url),
+                self.groq_service.extract_faqs(distill_page(faq_html))
+            )
+        elif faq_status == 404:
+            # Both come from the homepage, so one combined prompt saves an LLM round trip
+            brand_info, faqs_data = await self.groq_service.extract_all(page_text, base_url)
+        else:
+            # The FAQ page may exist but failed this once; fall back to the homepage without the combined prompt
+            brand_info, faqs_data = await asyncio.gather(
+                self.groq_service.extract_brand_info(page_text, base_url),
+                self.groq_service.extract_faqs(page_text)
+            )
+        return brand_info, _to_faqs(faqs_data)
+
     async def extract_policies(self, base_url: str) -> PolicyInfo:
         """Extract policy information"""
         policies = PolicyInfo()
@@ -160,61 +453,57 @@ class ShopifyScraper:
             'shipping_policy': ['/pages/shipping-policy', '/policies/shipping-policy', '/shipping']
         }
 
-        for policy_type, urls in policy_urls.items():
-            for url_path in urls:
-                try:
-                    full_url = urljoin(base_url, url_path)
-                    html, status = await self.fetch_url(full_url)
-                    if status == 200 and html:
-                        setattr(policies, policy_type, full_url)
-                        break
-                except Exception as e:
-                    logging.error(f"Error extracting policy {policy_type}: {str(e)}")
+        # Probe each distinct path once (some are shared between policies) concurrently;
+        # head_url takes one of the host's request slots, so the store is not stampeded
+        unique_paths = list(dict.fromkeys(path for paths in policy_urls.values() for path in paths))
+        results = await asyncio.gather(
+            *(self.head_url(urljoin(base_url, path)) for path in unique_paths),
+            return_exceptions=True
+        )
+        found = set()
+        for path, result in zip(unique_paths, results):
+            if isinstance(result, Exception):
+                logging.error("Error probing policy page %s: %s", path, result)
+            elif result == 200:
+                found.add(path)
+
+        # Pick per policy in priority order
+        for policy_type, paths in policy_urls.items():
+            path = next((p for p in paths if p in found), None)
+            if path is not None:
+                setattr(policies, policy_type, urljoin(base_url, path))
 
         return policies
 
-    def extract_important_links(self, html: str, base_url: str) -> Dict[str, str]:
-        """Extract important links from HTML"""
+    def extract_important_links(self, hrefs: List[str], base_url: str) -> Dict[str, str]:
+        """Extract important links from the homepage's anchor hrefs"""
         try:
-            soup = BeautifulSoup(html, 'html.parser')
             important_links = {}
+            remaining = set(_LINK_PATTERNS)
 
-            link_patterns = {
-                'Contact Us': ['/pages/contact', '/contact', '/contact-us'],
-                'About Us': ['/pages/about', '/about', '/about-us'],
-                'Order Tracking': ['/account/login', '/track', '/tracking'],
-                'Blog': ['/blogs', '/blog'],
-                'Support': ['/pages/support', '/support', '/help'],
-                'Size Guide': ['/pages/size-guide', '/size-guide'],
-                'FAQ': ['/pages/faq', '/faq', '/pages/frequently-asked-questions']
-            }
-
-            for link_name, patterns in link_patterns.items():
-                for pattern in patterns:
-                    link_elem = soup.find('a', href=re.compile(pattern, re.IGNORECASE))
-                    if link_elem:
-                        href = link_elem.get('href')
-                        if href:
-                            full_url = urljoin(base_url, href)
-                            important_links[link_name] = full_url
-                            break
+            # Single pass over the anchors; each category takes its first matching href
+            for href in hrefs:
+                for link_name in list(remaining):
+                    if _LINK_PATTERNS[link_name].search(href):
+                        important_links[link_name] = urljoin(base_url, href)
+                        remaining.discard(link_name)
+                if not remaining:
+                    break
 
             return important_links
         except Exception as e:
-            logging.error(f"Error extracting important links: {str(e)}")
+            logging.error("Error extracting important links: %s", e)
             return {}
 
     async def scrape_shopify_store(self, url: str) -> BrandInsights:
         """Main method to scrape Shopify store"""
         try:
-            logging.info(f"Starting to scrape Shopify store: {url}")
+            logging.info("Starting to scrape Shopify store: %s", url)
 
-            if not url.startswith(('http://', 'https://')):
-                url = 'https://' + url
+            url = normalize_url(url)
 
-            # Fetch homepage
-            html, status = await self.fetch_url(url)
-            await asyncio.sleep(1)  # Rate limiting
+            # Fetch homepage; it is parsed once below, so memoizing the raw body would only pin it
+            html, status = await self._fetch_url(url, None, True)
             
             if status != 200:
                 return BrandInsights(
@@ -225,49 +514,52 @@ class ShopifyScraper:
 
             logging.info("Homepage fetched successfully")
 
-            # Check if it's likely a Shopify store
-            if 'shopify' not in html.lower() and 'cdn.shopify.com' not in html:
-                products_data = await self.get_products_json(url)
-                if not products_data:
+            # Parse the homepage once; the extractors below only need its hrefs and Groq
+            # only needs the distilled text
+            hrefs, script_srcs, page_text = _parse_homepage(html)
+            has_marker = (
+                any('cdn.shopify.com' in src for src in script_srcs)
+                or _SHOPIFY_MARKER_RE.search(html, 0, MARKER_SCAN_CHARS) is not None
+            )
+            # Drop our reference to the raw page before the long awaits below
+            del html
+
+            # The FAQ page overlaps the Shopify probe and the products fetch
+            faq_page = self.fetch_faq_page(url)
+
+            # Check if it's likely a Shopify store; probe products.json only when markers are missing
+            if not has_marker:
+                if not await self._is_shopify(url):
+                    faq_page.cancel()
+                    await asyncio.gather(faq_page, return_exceptions=True)
                     return BrandInsights(
                         website_url=url,
                         status="error",
                         error_message="Not a Shopify store or products not accessible"
                     )
 
-            # Get all products
-            products_data = await self.get_products_json(url)
-            await asyncio.sleep(1)  # Rate limiting
-            
-            logging.info(f"Found {len(products_data)} products")
-            all_products = [self.parse_product(product) for product in products_data]
-
-            # Extract hero products
-            hero_products = await self.extract_hero_products(html, all_products)
-            logging.info(f"Extracted {len(hero_products)} hero products")
-
-            # Extract brand info using Groq
-            brand_info = await self.groq_service.extract_brand_info(html, url)
-            logging.info("Brand info extracted using Groq")
+            # Everything below only needs the homepage, so run it concurrently
+            products_data, (brand_info, faqs), policies = await asyncio.gather(
+                self.get_products_json(url),
+                self.extract_brand_and_faqs(url, page_text, faq_page),
+                self.extract_policies(url)
+            )
+            logging.info("Found %s products, %s FAQs", len(products_data), len(faqs))
 
-            # Extract FAQs
-            faq_html, _ = await self.fetch_url(urljoin(url, '/pages/faq'))
-            await asyncio.sleep(0.5)  # Rate limiting
-            
-            if not faq_html:
-                faq_html = html
-            faqs_data = await self.groq_service.extract_faqs(faq_html)
-            faqs = [FAQ(question=faq.get('question', ''), answer=faq.get('answer', '')) 
-                   for faq in faqs_data if faq.get('question') and faq.get('answer')]
-            logging.info(f"Extracted {len(faqs)} FAQs")
+            if len(products_data) > PARSE_OFFLOAD_THRESHOLD:
+                # A worker thread keeps other scrapes responsive; a process pool would
+                # spend more time pickling the catalog than parsing it
+                all_products = await asyncio.to_thread(self.parse_products, products_data)
+            else:
+                all_products = self.parse_products(products_data)
 
-            # Extract policies
-            policies = await self.extract_policies(url)
-            logging.info("Policies extracted")
+            # Extract hero products
+            hero_products = await self.extract_hero_products(hrefs, all_products)
+            logging.info("Extracted %s hero products", len(hero_products))
 
             # Extract important links
-            important_links = self.extract_important_links(html, url)
-            logging.info(f"Extracted {len(important_links)} important links")
+            important_links = self.extract_important_links(hrefs, url)
+            logging.info("Extracted %s important links", len(important_links))
 
             # Build contact info
             contact_info = ContactInfo(
@@ -275,20 +567,19 @@ class ShopifyScraper:
                 phones=brand_info.get('contact_phones', [])
             )
 
-            # Build social handles
-            social_data = brand_info.get('social_handles', {})
-            social_handles = SocialHandles(
-                instagram=social_data.get('instagram'),
-                facebook=social_data.get('facebook'),
-                twitter=social_data.get('twitter'),
-                tiktok=social_data.get('tiktok'),
-                youtube=social_data.get('youtube'),
-                linkedin=social_data.get('linkedin')
-            )
+            # Build social handles; profiles linked from the page win, and the LLM's
+            # answers are reduced to bare handles the same way
+            social_data = brand_info.get('social_handles') or {}
+            link_handles = extract_social_handles(' '.join(hrefs))
+            social_handles = SocialHandles(**{
+                platform: link_handles.get(platform) or extract_social_handle(social_data.get(platform), platform)
+                for platform in SocialHandles.model_fields
+            })
 
             logging.info("Successfully completed scraping")
 
-            return BrandInsights(
+            # Every piece below is already a validated model or plain value
+            return BrandInsights.model_construct(
                 website_url=url,
                 brand_name=brand_info.get('brand_name', ''),
                 brand_description=brand_info.get('brand_description', ''),
@@ -304,7 +595,7 @@ class ShopifyScraper:
             )
 
         except Exception as e:
-            logging.error(f"Error scraping {url}: {str(e)}", exc_info=True)
+            logging.error("Error scraping %s: %s", url, e, exc_info=True)
             return BrandInsights(
                 website_url=url,
                 status="error",
@@ -1,6 +1,6 @@
 import re
 from urllib.parse import urlparse
-from typing import Optional
+from typing import Dict, Optional
 
 def validate_url(url: str) -> bool:
     """Validate if URL is properly formatted"""
@@ -10,6 +10,13 @@ def validate_url(url: str) -> bool:
     except:
         return False
 
+def normalize_url(url: str) -> str:
+    """Strip whitespace and default to https:// when no scheme is given"""
+    url = url.strip()
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+    return url
+
 def extract_domain(url: str) -> Optional[str]:
     """Extract domain from URL"""
     try:
@@ -17,31 +24,61 @@ def extract_domain(url: str) -> Optional[str]:
     except:
         return None
 
+_TAGS = re.compile(r'<[^>]+>')
+
 def clean_text(text: str) -> str:
     """Clean and normalize text"""
     if not text:
         return ""
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text.strip())
-    # Remove HTML tags
-    text = re.sub(r'<[^>]+>', '', text)
-    return text
+    # Remove HTML tags, then collapse whitespace (split/join runs in C in one pass)
+    return ' '.join(_TAGS.sub('', text).split())
+
+# Profile URL prefix per platform; the handle is the path segment that follows
+_SOCIAL_PREFIXES = {
+    'instagram': r'instagram\.com/',
+    'twitter': r'twitter\.com/',
+    'tiktok': r'tiktok\.com/@?',
+    'facebook': r'facebook\.com/'
+}
+
+# A handle is one path segment. Since input may be free text it also stops at whitespace,
+# quotes and angle brackets, and may not end in sentence punctuation such as ',;.)'.
+_HANDLE = r'[^/?\s"\'<>]*[^/?\s"\'<>,;.)]'
+
+_SOCIAL_PATTERNS = {
+    platform: re.compile(fr'{prefix}({_HANDLE})', re.IGNORECASE)
+    for platform, prefix in _SOCIAL_PREFIXES.items()
+}
+
+# Every platform in one alternation; the named group that matched identifies the platform
+_SOCIAL_ANY = re.compile(
+    '|'.join(fr'{prefix}(?P<{platform}>{_HANDLE})' for platform, prefix in _SOCIAL_PREFIXES.items()),
+    re.IGNORECASE
+)
+
+# First path segments of share buttons and posts, which name no account
+_NOT_HANDLES = frozenset({'sharer', 'sharer.php', 'share', 'intent', 'plugins', 'dialog', 'p', 'reel', 'tr'})
+
+def extract_social_handles(text: str) -> Dict[str, str]:
+    """Return the first handle per platform found anywhere in text, in a single scan"""
+    handles: Dict[str, str] = {}
+    for match in _SOCIAL_ANY.finditer(text or ''):
+        handle = match.group(match.lastgroup)
+        if handle.lower() in _NOT_HANDLES:
+            continue
+        handles.setdefault(match.lastgroup, handle)
+        if len(handles) == len(_SOCIAL_PREFIXES):
+            break
+    return handles
 
 def extract_social_handle(url: str, platform: str) -> Optional[str]:
     """Extract social media handle from URL"""
     if not url:
         return None
-        
-    patterns = {
-        'instagram': r'instagram\.com/([^/?]+)',
-        'twitter': r'twitter\.com/([^/?]+)',
-        'tiktok': r'tiktok\.com/@?([^/?]+)',
-        'facebook': r'facebook\.com/([^/?]+)'
-    }
-    
-    pattern = patterns.get(platform.lower())
+
+    pattern = _SOCIAL_PATTERNS.get(platform.lower())
     if pattern:
-        match = re.search(pattern, url, re.IGNORECASE)
+        match = pattern.search(url)
         if match:
             return match.group(1)
     
@@ -1,11 +1,29 @@
+import os
 import uvicorn
 from app.main import app
 
+DEBUG = os.getenv("DEBUG", "").lower() in ("1", "true", "yes")
+
 if __name__ == "__main__":
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
+    if DEBUG:
+        # Auto-reload only works with a single worker
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True,
+            log_level="info"
+        )
+    else:
+        workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+        # Workers inherit this and split the per-store request limits between them
+        os.environ["WEB_CONCURRENCY"] = str(workers)
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=8000,
+            loop="uvloop",
+            http="httptools",
+            workers=workers,
+            log_level="info"
+        )